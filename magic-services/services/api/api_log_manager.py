@@ -1,4 +1,8 @@
-from datetime import datetime
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
 from enum import Enum
 from pathlib import Path
 from typing import Optional
@@ -11,32 +15,101 @@ class LogLevel(Enum):
     SUCCESS = "SUCCESS"
 
 
+# Nivel propio para los mensajes de éxito, entre INFO y WARNING
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+_LOGGING_LEVELS = {
+    LogLevel.INFO: logging.INFO,
+    LogLevel.WARNING: logging.WARNING,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.SUCCESS: SUCCESS,
+}
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter `[timestamp] [LEVEL] mensaje` que solo recalcula strftime una vez por segundo."""
+
+    def __init__(self):
+        super().__init__("[%(asctime)s] [%(levelname)s] %(message)s")
+        self._ts_sec = -1
+        self._ts = ""
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._ts_sec:
+            self._ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._ts_sec = sec
+        return self._ts
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que encola el registro sin formatearlo: el formateo se hace en el hilo
+    del listener. Válido porque los argumentos que se pasan son inmutables (str/int).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def _rotated_name(default_name: str) -> str:
+    """`api.log.YYYY-MM-DD` -> `api_YYYY-MM-DD.log`, el nombre de los logs diarios."""
+    path = Path(default_name)
+    day = path.name.rsplit(".", 1)[-1]
+    return str(path.with_name(f"api_{day}.log"))
+
+
 class APILogManager:
     """Gestor de logs simple para la API. Muy parecido al LogManager del scrapper.
-    Registra líneas en un archivo de texto con timestamp y nivel.
+    Registra líneas en un archivo de texto con timestamp y nivel dentro de `log_dir`:
+    el día en curso en `api.log`, que a medianoche se rota a `api_YYYY-MM-DD.log`.
+
+    Se apoya en `logging`: quien registra solo encola el mensaje (QueueHandler) y un hilo
+    de fondo (QueueListener) lo formatea y lo escribe en disco.
     """
 
-    def __init__(self, log_file: Optional[str] = None):
-        if log_file is None:
-            log_file = "api_log/api_" + datetime.now().strftime("%Y-%m-%d") + ".log"
+    def __init__(self, log_dir: Optional[str] = None):
+        if log_dir is None:
+            log_dir = "api_log"
 
-        self.log_file_path = Path(log_file)
+        self.log_dir = Path(log_dir)
+        self.log_file_path = self.log_dir / "api.log"
         # asegurar directorio
-        if not self.log_file_path.parent.exists():
+        if not self.log_dir.exists():
             try:
-                self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
+                self.log_dir.mkdir(parents=True, exist_ok=True)
             except Exception:
                 pass
 
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            self.log_file_path, when="midnight", encoding="utf-8", delay=True
+        )
+        file_handler.namer = _rotated_name
+        file_handler.setFormatter(_CachedTimeFormatter())
+
+        log_queue = queue.SimpleQueue()
+        self._logger = logging.getLogger("api")
+        self._logger.handlers.clear()
+        self._logger.addHandler(_DeferredQueueHandler(log_queue))
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+
+        self._listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.close)
+
     def _write_log(self, level: LogLevel, message: str) -> None:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] [{level.value}] {message}\n"
-        try:
-            with open(self.log_file_path, "a", encoding="utf-8") as f:
-                f.write(entry)
-        except Exception:
-            # No raise: logging should never break the app
-            pass
+        # logging no propaga errores de escritura: el log nunca rompe la app
+        self._logger.log(_LOGGING_LEVELS[level], message)
+
+    def close(self) -> None:
+        """Escribe lo que quede en la cola y detiene el hilo de escritura."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
 
     def info(self, message: str) -> None:
         self._write_log(LogLevel.INFO, message)
@@ -51,6 +124,4 @@ class APILogManager:
         self._write_log(LogLevel.SUCCESS, message)
 
     def request(self, method: str, path: str, query: str, body: str, client: str, status: int) -> None:
-        msg = f"{client} {method} {path} {query} -> {status} | body={body}"
-        self.info(msg)
-
+        self._logger.info("%s %s %s %s -> %s | body=%s", client, method, path, query, status, body)
@@ -1,76 +1,379 @@
 from fastapi import FastAPI, HTTPException, Query, Body, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from pathlib import Path
-import json
-from typing import Any, Dict, List, Optional
+import asyncio
+import orjson
+from typing import Any, Dict, List, Optional, Tuple
 import os
+import shutil
 from api_log_manager import APILogManager
-from datetime import datetime
 import re
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
 
-app = FastAPI(title="Magic Scrapper API", version="0.1")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arranque y parada de la API: con `API_LOG_ARCHIVE_DIR` definido, archiva los logs
+    periódicamente mientras la API está en marcha y una última vez al pararla.
+    """
+    log_sync_task = None
+    if API_LOG_ARCHIVE_DIR:
+        log_sync_task = asyncio.create_task(_sync_log_archive_periodically(Path(API_LOG_ARCHIVE_DIR)))
+    try:
+        yield
+    finally:
+        if log_sync_task is not None:
+            log_sync_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await log_sync_task
+        # Vaciar la cola del log en disco antes de la última copia: si no, las últimas líneas
+        # se quedarían fuera del archivo y se perderían con el tmpfs
+        await asyncio.to_thread(logger.close)
+        if API_LOG_ARCHIVE_DIR:
+            try:
+                await asyncio.to_thread(_sync_log_archive, Path(API_LOG_ARCHIVE_DIR))
+            except Exception:
+                pass
+
+
+app = FastAPI(
+    title="Magic Scrapper API", version="0.1", default_response_class=ORJSONResponse, lifespan=lifespan
+)
 
 # Path inside the container where bulk-data will be mounted
 BULK_DATA_DIR = Path("/data/bulk-data")
 
-# Inicializar logger de la API (archivo en la carpeta del servicio)
-api_log_path = Path(__file__).parent / "api_log" / f"api_{datetime.now().strftime('%Y-%m-%d')}.log"
-logger = APILogManager(str(api_log_path))
 
+@lru_cache(maxsize=None)
+def get_api_log_dir() -> Path:
+    """Carpeta de logs de la API, junto al código del servicio."""
+    return Path(__file__).parent / "api_log"
+
+
+# Carpeta persistente donde se archivan periódicamente los logs cuando `api_log` está en un
+# tmpfs (ver docker-compose.yml). Sin definir, los logs se quedan solo en `api_log`.
+API_LOG_ARCHIVE_DIR = os.getenv("API_LOG_ARCHIVE_DIR")
+API_LOG_SYNC_INTERVAL = float(os.getenv("API_LOG_SYNC_INTERVAL", "300"))
 
-@app.middleware("http")
-async def log_requests_middleware(request: Request, call_next):
-    """Middleware que registra cada petición y su respuesta en el log."""
-    try:
-        body_bytes = await request.body()
-        body_text = body_bytes.decode("utf-8") if body_bytes else ""
-    except Exception:
-        body_text = "<unreadable>"
 
-    # Query string
-    query = request.url.query or ""
-    client = request.client.host if request.client else "-"
+def _restore_active_log(archive_dir: Path) -> None:
+    """Recupera el log del día archivado si `api_log` está vacío (tmpfs tras reiniciar),
+    para que la siguiente sincronización no lo sobrescriba. Conserva el mtime para que la
+    rotación diaria siga funcionando.
+    """
+    source = archive_dir / "api.log"
+    target = get_api_log_dir() / "api.log"
+    if source.exists() and not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
 
-    response = await call_next(request)
 
+if API_LOG_ARCHIVE_DIR:
     try:
-        status = response.status_code
+        _restore_active_log(Path(API_LOG_ARCHIVE_DIR))
     except Exception:
+        pass
+
+# Inicializar logger de la API (un archivo por día en la carpeta de logs)
+logger = APILogManager(str(get_api_log_dir()))
+
+# Caché en memoria de las cartas ya parseadas:
+# ruta -> (st_mtime_ns, st_size, datos, índice nombre -> posiciones en datos).
+# Solo la usan /cards-delete y /cards-update (/cards-data envía el archivo sin parsearlo):
+# se llena con la primera modificación y solo guarda la versión del archivo más reciente.
+_CARDS_CACHE: Dict[Path, Tuple[int, int, List[Dict[str, Any]], Dict[str, List[int]]]] = {}
+
+# Buffer de escritura al reescribir el archivo de cartas: agrupa los registros en pocas
+# llamadas write(2) en lugar de una cada 8 KB
+_CARDS_WRITE_BUFFER = 1024 * 1024
+
+# Memoización breve de `_latest_json_file`: directorio -> (instante de caducidad, ruta)
+_LATEST_JSON_TTL = 1.0
+_LATEST_JSON_MEMO: Dict[Path, Tuple[float, Optional[Path]]] = {}
+
+# Serializa lectura -> modificación -> escritura del archivo de cartas entre peticiones,
+# ya que el trabajo bloqueante se ejecuta en hilos y las peticiones pueden intercalarse
+_CARDS_LOCK = asyncio.Lock()
+
+
+class RequestLoggingASGI:
+    """Middleware ASGI puro que registra cada petición y su respuesta en el log.
+
+    Lee método, ruta, query y cliente directamente del `scope`, sin crear objetos
+    Request/Response ni tareas adicionales por petición. Del body solo se registra su
+    tamaño (cabecera `content-length`), salvo en métodos con body y menor de
+    `MAX_LOGGED_BODY` bytes: entonces se copia a medida que la aplicación lo consume.
+    """
+
+    BODY_METHODS = ("POST", "PUT", "PATCH")
+    MAX_LOGGED_BODY = 4096
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        body_len = 0
+        for key, value in scope["headers"]:
+            if key == b"content-length":
+                try:
+                    body_len = int(value)
+                except ValueError:
+                    pass
+                break
+
+        body = None
         status = 0
+        app_receive = receive
+
+        if scope["method"] in self.BODY_METHODS and 0 < body_len < self.MAX_LOGGED_BODY:
+            body = bytearray()
+
+            async def receive_wrapper():
+                message = await receive()
+                if message["type"] == "http.request":
+                    body.extend(message.get("body", b""))
+                return message
+
+            app_receive = receive_wrapper
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, app_receive, send_wrapper)
+        finally:
+            if body is not None:
+                try:
+                    body_text = body.decode("utf-8")
+                except Exception:
+                    body_text = "<unreadable>"
+            elif body_len:
+                body_text = f"<{body_len} bytes>"
+            else:
+                body_text = ""
+
+            query = scope.get("query_string", b"").decode("latin-1")
+            client = scope.get("client")
+            client_host = client[0] if client else "-"
+
+            # Registrar usando el logger
+            try:
+                logger.request(scope["method"], scope["path"], query, body_text, client_host, status)
+            except Exception:
+                pass
+
+
+app.add_middleware(RequestLoggingASGI)
+# Comprimir respuestas de 1 KB o más (el JSON de cartas se reduce varias veces)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+def _latest_file(directory: Path, prefix: str, suffix: str) -> Optional[Path]:
+    """Archivo más reciente (por mtime) de `directory` cuyo nombre empieza por `prefix` y
+    termina en `suffix`. Un solo recorrido con scandir, sin ordenar.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.name.startswith(prefix) and e.name.endswith(suffix) and e.is_file()]
+        if not entries:
+            return None
+        return Path(max(entries, key=lambda e: e.stat().st_mtime_ns).path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _latest_json_file(directory: Path) -> Optional[Path]:
+    now = time.monotonic()
+    memo = _LATEST_JSON_MEMO.get(directory)
+    if memo is not None and memo[0] > now:
+        return memo[1]
+
+    latest = _latest_file(directory, "scryfall_cards_", ".json")
+    _LATEST_JSON_MEMO[directory] = (now + _LATEST_JSON_TTL, latest)
+    # Si el scrapper ha generado un archivo nuevo, soltar la versión anterior ya parseada
+    # en lugar de mantenerla en memoria hasta la siguiente modificación
+    for cached_path in [p for p in _CARDS_CACHE if p.parent == directory and p != latest]:
+        _CARDS_CACHE.pop(cached_path, None)
+    return latest
+
+
+def _etag(st: os.stat_result) -> str:
+    """ETag de un archivo a partir de su mtime y tamaño (la misma clave que la caché).
+    Débil (`W/`): GZipMiddleware puede servir el mismo archivo comprimido o sin comprimir,
+    y un ETag fuerte tendría que ser distinto para cada representación.
+    """
+    return f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de `If-None-Match` (lista separada por comas o `*`) con `etag`."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag == "*" or tag.removeprefix("W/") == opaque
+        for tag in (t.strip() for t in if_none_match.split(","))
+    )
+
+
+def _build_name_index(data: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Índice invertido nombre -> posiciones de sus registros en `data`.
+    Solo se indexan nombres de tipo str (los que se pueden buscar desde la query); un `name`
+    de otro tipo, p. ej. una lista escrita por /cards-update, simplemente no se indexa.
+    """
+    name_index = defaultdict(list)
+    for i, rec in enumerate(data):
+        n = rec.get("name")
+        if isinstance(n, str):
+            name_index[n].append(i)
+    return name_index
+
+
+def _load_cards(path: Path) -> Tuple[List[Dict[str, Any]], Dict[str, List[int]]]:
+    """Devuelve las cartas del archivo y su índice por nombre, reutilizando la caché si el
+    archivo no ha cambiado (mismo mtime y tamaño). Ambos son compartidos: no deben modificarse.
+    """
+    st = path.stat()
+    cached = _CARDS_CACHE.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2], cached[3]
+
+    data = orjson.loads(path.read_bytes())
+    name_index = _build_name_index(data)
+    _CARDS_CACHE.clear()
+    _CARDS_CACHE[path] = (st.st_mtime_ns, st.st_size, data, name_index)
+    return data, name_index
+
+
+def _store_cards(path: Path, data: List[Dict[str, Any]]) -> None:
+    """Actualiza la caché tras reescribir el archivo con `data`."""
+    st = path.stat()
+    name_index = _build_name_index(data)
+    _CARDS_CACHE.clear()
+    _CARDS_CACHE[path] = (st.st_mtime_ns, st.st_size, data, name_index)
+
+
+def _dump_cards(f, data: List[Dict[str, Any]]) -> None:
+    """Escribe las cartas como array JSON con un registro por línea. Se serializa registro a
+    registro para no tener en memoria una segunda copia completa del archivo.
+    """
+    f.write(b"[\n")
+    for i, rec in enumerate(data):
+        if i:
+            f.write(b",\n")
+        f.write(orjson.dumps(rec))
+    f.write(b"\n]\n")
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Sincroniza la entrada de directorio para que el rename sobreviva a una caída."""
+    try:
+        dir_fd = os.open(str(directory), os.O_RDONLY | os.O_DIRECTORY)
+    except OSError as e:
+        logger.warning(f"No se pudo abrir {directory} para fsync: {e}")
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError as e:
+        logger.warning(f"No se pudo hacer fsync de {directory}: {e}")
+    finally:
+        os.close(dir_fd)
+
 
-    # Registrar usando el logger
+def _write_cards(path: Path, data: List[Dict[str, Any]]) -> None:
+    """Reescribe de forma segura y duradera el archivo de cartas y actualiza la caché:
+    tmp + fsync -> os.replace -> fsync del directorio.
+    Bloqueante: se ejecuta fuera del event loop con `asyncio.to_thread`.
+    """
+    tmp_path = path.with_suffix(".tmp")
     try:
-        logger.request(request.method, request.url.path, query, body_text, client, status)
+        with open(tmp_path, "wb", buffering=_CARDS_WRITE_BUFFER) as f:
+            _dump_cards(f, data)
+            f.flush()
+            os.fsync(f.fileno())
+        # Reemplazo atómico
+        os.replace(str(tmp_path), str(path))
     except Exception:
-        pass
+        # Si falla la escritura, intentar eliminar el tmp si existe
+        try:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        except Exception:
+            pass
+        raise
 
-    return response
+    _fsync_dir(path.parent)
+    # El archivo ya está escrito: si falla la actualización de la caché no es un error de la
+    # petición, se descarta la entrada y la siguiente lectura vuelve a parsear el archivo
+    try:
+        _store_cards(path, data)
+    except Exception as e:
+        _CARDS_CACHE.pop(path, None)
+        logger.warning(f"No se pudo actualizar la caché de cartas ({path.name}): {e}")
 
 
-def _latest_json_file(directory: Path) -> Optional[Path]:
-    if not directory.exists() or not directory.is_dir():
-        return None
-    files = list(directory.glob("scryfall_cards_*.json"))
-    if not files:
-        return None
-    files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return files[0]
+def _sync_log_archive(archive_dir: Path) -> None:
+    """Copia los logs de `api_log` a `archive_dir` (copia a .tmp + os.replace). Los días ya
+    rotados se borran de `api_log` tras copiarlos para no llenar el tmpfs.
+    """
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    with os.scandir(get_api_log_dir()) as it:
+        entries = [e for e in it if e.name.startswith("api") and e.name.endswith(".log") and e.is_file()]
+
+    for entry in entries:
+        target = archive_dir / entry.name
+        tmp_path = target.with_suffix(".tmp")
+        try:
+            shutil.copy2(entry.path, tmp_path)
+            os.replace(str(tmp_path), str(target))
+            if entry.name != logger.log_file_path.name:
+                os.unlink(entry.path)
+        except Exception as e:
+            logger.warning(f"No se pudo archivar el log {entry.name}: {e}")
+
+
+async def _sync_log_archive_periodically(archive_dir: Path) -> None:
+    while True:
+        await asyncio.sleep(API_LOG_SYNC_INTERVAL)
+        try:
+            await asyncio.to_thread(_sync_log_archive, archive_dir)
+        except Exception as e:
+            logger.warning(f"Error al archivar los logs en {archive_dir}: {e}")
 
 
 @app.get("/cards-data")
-async def get_cards_data_json():
-    """Devuelve el contenido del JSON más reciente generado por el scrapper."""
+async def get_cards_data_json(request: Request):
+    """Devuelve el contenido del JSON más reciente generado por el scrapper.
+    El archivo ya es JSON válido, así que se envía tal cual sin parsearlo ni reserializarlo.
+    Responde 304 si el cliente ya tiene la versión actual (cabecera `If-None-Match`).
+    """
     latest = _latest_json_file(BULK_DATA_DIR)
     if latest is None:
         raise HTTPException(status_code=404, detail="No hay archivos de datos disponibles")
 
     try:
-        with open(latest, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        st = latest.stat()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al leer el archivo: {e}")
 
-    return JSONResponse(content=data)
+    headers = {"ETag": _etag(st), "Cache-Control": "max-age=60"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    # Sin stat_result: Starlette hace su propio stat al abrir el archivo, así Content-Length
+    # corresponde al archivo que se envía aunque /cards-update lo haya reemplazado entretanto
+    return FileResponse(str(latest), media_type="application/json", headers=headers)
 
 
 @app.delete("/cards-delete")
@@ -83,35 +386,26 @@ async def delete_card(name: str = Query(..., description="Nombre exacto de la ca
     if latest is None:
         raise HTTPException(status_code=404, detail="No hay archivos de datos disponibles")
 
-    try:
-        with open(latest, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al leer el archivo: {e}")
+    async with _CARDS_LOCK:
+        try:
+            data, name_index = await asyncio.to_thread(_load_cards, latest)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error al leer el archivo: {e}")
 
-    # Filtrar por nombre exacto
-    original_count = len(data)
-    filtered = [rec for rec in data if rec.get("name") != name]
-    removed = original_count - len(filtered)
+        # Posiciones de los registros con el nombre exacto
+        indices = name_index.get(name)
+        if not indices:
+            raise HTTPException(status_code=404, detail=f"No se encontró ninguna carta con el nombre exacto '{name}'")
 
-    if removed == 0:
-        raise HTTPException(status_code=404, detail=f"No se encontró ninguna carta con el nombre exacto '{name}'")
+        filtered = list(data)
+        for i in reversed(indices):
+            del filtered[i]
+        removed = len(indices)
 
-    # Escribir de forma segura el archivo actualizado
-    tmp_path = latest.with_suffix(".tmp")
-    try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(filtered, f, ensure_ascii=False, indent=2)
-        # Reemplazo atómico
-        os.replace(str(tmp_path), str(latest))
-    except Exception as e:
-        # Si falla la escritura, intentar eliminar el tmp si existe
         try:
-            if tmp_path.exists():
-                tmp_path.unlink()
-        except Exception:
-            pass
-        raise HTTPException(status_code=500, detail=f"Error al actualizar el archivo: {e}")
+            await asyncio.to_thread(_write_cards, latest, filtered)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error al actualizar el archivo: {e}")
 
     return {"status": "success", "removed": removed, "file": latest.name}
 
@@ -129,82 +423,75 @@ async def update_card(
     if latest is None:
         raise HTTPException(status_code=404, detail="No hay archivos de datos disponibles")
 
-    try:
-        with open(latest, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al leer el archivo: {e}")
+    async with _CARDS_LOCK:
+        try:
+            data, name_index = await asyncio.to_thread(_load_cards, latest)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error al leer el archivo: {e}")
 
-    updated_count = 0
-    for rec in data:
-        if rec.get("name") == name:
-            for k, v in updates.items():
-                rec[k] = v
-            updated_count += 1
+        indices = name_index.get(name)
+        if not indices:
+            raise HTTPException(status_code=404, detail=f"No se encontró ninguna carta con el nombre exacto '{name}'")
 
-    if updated_count == 0:
-        raise HTTPException(status_code=404, detail=f"No se encontró ninguna carta con el nombre exacto '{name}'")
+        # Copiar solo los registros modificados para no alterar la caché si falla la escritura
+        data = list(data)
+        for i in indices:
+            data[i] = {**data[i], **updates}
+        updated_count = len(indices)
 
-    tmp_path = latest.with_suffix(".tmp")
-    try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(str(tmp_path), str(latest))
-    except Exception as e:
         try:
-            if tmp_path.exists():
-                tmp_path.unlink()
-        except Exception:
-            pass
-        raise HTTPException(status_code=500, detail=f"Error al actualizar el archivo: {e}")
+            await asyncio.to_thread(_write_cards, latest, data)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error al actualizar el archivo: {e}")
 
     return {"status": "success", "updated": updated_count, "file": latest.name}
 
+# Patrón para parsear las líneas de petición del log, aplicado sobre el archivo completo en bytes
+# Formato: [timestamp] [level] ip method path query -> status | body=...
+_LOG_LINE_RE = re.compile(
+    rb"^[ \t]*\[(?P<timestamp>[^\]\n]+)\][ \t]+\[(?P<level>[^\]\n]+)\][ \t]+(?P<ip>\S+)[ \t]+(?P<method>\S+)"
+    rb"[ \t]+(?P<path>\S+)[ \t]+(?P<query>\S*)[ \t]+->[ \t]+(?P<status>\d+)[ \t]+\|[ \t]+body=(?P<body>[^\r\n]*?)[ \t\r]*$",
+    re.MULTILINE,
+)
+
+
 def _latest_log_file(directory: Path) -> Optional[Path]:
-    if not directory.exists() or not directory.is_dir():
-        return None
-    files = list(directory.glob("api_*.log"))
-    if not files:
-        return None
-    files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return files[0]
+    # `api.log` (día en curso) o `api_YYYY-MM-DD.log` (días ya rotados)
+    return _latest_file(directory, "api", ".log")
+
+
+def _parse_log_file(log_file: Path) -> List[Dict[str, Any]]:
+    """Parsea las líneas de petición del archivo de log. Bloqueante: se ejecuta en un hilo."""
+    return [
+        {
+            "timestamp": m["timestamp"].decode(),
+            "level": m["level"].decode(),
+            "ip": m["ip"].decode(),
+            "method": m["method"].decode(),
+            "path": m["path"].decode(),
+            "query": m["query"].decode() or None,
+            "status": int(m["status"]),
+            "body": m["body"].decode() or None,
+        }
+        for m in _LOG_LINE_RE.finditer(log_file.read_bytes())
+    ]
+
 
 @app.get("/logs-data")
 async def get_logs_data():
-    """Devuelve el contenido del archivo de logs más reciente en formato JSON."""
-    latest_log_file = _latest_log_file(Path(__file__).parent / "api_log")
+    """Devuelve el contenido del archivo de logs más reciente en formato JSON.
+    Sin ETag: cada petición (incluida la anterior a /logs-data) añade una línea al log, así que
+    el archivo siempre ha cambiado y una revalidación nunca podría responder 304.
+    """
+    latest_log_file = _latest_log_file(get_api_log_dir())
 
     if latest_log_file is None or not latest_log_file.exists():
         raise HTTPException(status_code=404, detail="El archivo de log no existe")
 
-    # Patrón regex para parsear las líneas de log
-    # Formato: [timestamp] [level] ip method path ? -> status | body=...
-    pattern = re.compile(
-        r"\[(?P<timestamp>[^\]]+)\]\s+\[(?P<level>[^\]]+)\]\s+(?P<ip>\S+)\s+(?P<method>\S+)\s+(?P<path>\S+)\s+(?P<query>\S*)\s+->\s+(?P<status>\d+)\s+\|\s+body=(?P<body>.*)"
-    )
-
-    parsed_logs = []
     try:
-        with open(latest_log_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                match = pattern.match(line)
-                if match:
-                    log_entry = {
-                        "timestamp": match.group("timestamp"),
-                        "level": match.group("level"),
-                        "ip": match.group("ip"),
-                        "method": match.group("method"),
-                        "path": match.group("path"),
-                        "query": match.group("query") or None,
-                        "status": int(match.group("status")),
-                        "body": match.group("body") or None,
-                    }
-                    parsed_logs.append(log_entry)
-
-        return JSONResponse(content={"logs": parsed_logs, "file": latest_log_file.name})
+        parsed_logs = await asyncio.to_thread(_parse_log_file, latest_log_file)
+        return ORJSONResponse(content={"logs": parsed_logs, "file": latest_log_file.name},
+                              headers={"Cache-Control": "no-cache"})
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al leer el archivo de log: {e}")
@@ -1,4 +1,6 @@
+import logging
 import os
+import time
 from datetime import datetime
 from enum import Enum
 
@@ -9,10 +11,57 @@ class LogLevel(Enum):
     ERROR = "ERROR"
     SUCCESS = "SUCCESS"
 
+# Nivel propio para los mensajes de éxito, entre INFO y WARNING
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+_LOGGING_LEVELS = {
+    LogLevel.INFO: logging.INFO,
+    LogLevel.WARNING: logging.WARNING,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.SUCCESS: SUCCESS,
+}
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter "[timestamp] [LEVEL] mensaje" que solo recalcula strftime una vez por segundo.
+    """
+
+    def __init__(self):
+        super().__init__("[%(asctime)s] [%(levelname)s] %(message)s")
+        self._ts_sec = -1
+        self._ts = ""
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._ts_sec:
+            self._ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._ts_sec = sec
+        return self._ts
+
+def _file_logger(log_file):
+    """
+    Devuelve el logger asociado a un archivo de log, con un único FileHandler por archivo
+    aunque se creen varios LogManager sobre él (uno por iteración en modo loop).
+
+    Args:
+        log_file (str): Ruta del archivo de log
+    """
+    path = os.path.abspath(log_file)
+    logger = logging.getLogger(f"scryfall_scraper:{path}")
+    if not logger.handlers:
+        handler = logging.FileHandler(path, encoding='utf-8', delay=True)
+        handler.setFormatter(_CachedTimeFormatter())
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
 class LogManager:
     """
     Gestor de logs para el scraper de Scryfall.
-    Registra todas las operaciones en un archivo de texto.
+    Registra todas las operaciones en un archivo de texto mediante `logging`.
+    El archivo se abre al escribir la primera entrada de la sesión y se cierra al terminarla.
     """
     
     def __init__(self, log_file="scryfall_scraper_log/scryfall_scraper.log"):
@@ -26,6 +75,7 @@ class LogManager:
         self.session_start = None
         self.cards_count = 0
         self.errors = []
+        self._logger = _file_logger(log_file)
         
     def _write_log(self, level, message):
         """
@@ -35,14 +85,14 @@ class LogManager:
             level (LogLevel): Nivel del mensaje
             message (str): Mensaje a escribir
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level.value}] {message}\n"
-        
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-        except Exception as e:
-            print(f"Error al escribir en el log: {e}")
+        self._logger.log(_LOGGING_LEVELS[level], message)
+
+    def close(self):
+        """
+        Cierra el archivo de log. Se vuelve a abrir si se registra otra entrada.
+        """
+        for handler in self._logger.handlers:
+            handler.close()
     
     def inicio_scraping(self):
         """
@@ -183,4 +233,5 @@ class LogManager:
         self.session_start = None
         self.cards_count = 0
         self.errors = []
+        self.close()
     
\ No newline at end of file
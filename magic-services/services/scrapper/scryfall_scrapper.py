@@ -1,13 +1,20 @@
 import requests
 import json
+import ijson
+import orjson
 
 import os
 from datetime import datetime
 from scrapper_log_manager import LogManager
+import heapq
 import random
-import re
 import time
-from typing import Dict, List, Any, Optional
+import queue
+import threading
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Any, Optional, Tuple, Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from sentence_transformers import SentenceTransformer
@@ -15,189 +22,296 @@ from sentence_transformers import SentenceTransformer
 # Cargar el modelo de embeddings una sola vez
 model = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
 
+# Hay pocos costes de maná distintos (unos miles) para cientos de miles de caras
+@lru_cache(maxsize=4096)
 def _parse_mana_cost_to_cmc(mana_cost: Optional[str]) -> int:
     """
     Convierte una cadena de coste de maná como "{2}{G}{U}" en su CMC numérico.
     - Los tokens numéricos se toman como su valor entero.
     - Cualquier token no numérico (letras, símbolos híbridos, X, etc.) se cuenta como 1.
+    Recorre la cadena una sola vez saltando entre llaves, sin expresiones regulares.
     """
     if not mana_cost or not isinstance(mana_cost, str):
         return 0
 
-    tokens = re.findall(r"\{([^}]*)\}", mana_cost)
     total = 0
-    for t in tokens:
-        t = t.strip()
+    end = -1
+    while True:
+        start = mana_cost.find("{", end + 1)
+        if start == -1:
+            break
+        end = mana_cost.find("}", start + 1)
+        if end == -1:
+            break
+
+        t = mana_cost[start + 1:end].strip()
         if t.isdigit():
             total += int(t)
             continue
 
-        m = re.match(r"^(\d+)", t)
-        if m:
-            total += int(m.group(1))
-            continue
-
-        # cualquier otro símbolo cuenta como 1
-        total += 1
+        # prefijo numérico (p. ej. "2/W"); cualquier otro símbolo cuenta como 1
+        n = 0
+        while n < len(t) and t[n].isdecimal():
+            n += 1
+        total += int(t[:n]) if n else 1
 
     return total
 
-def filtrar_carta(carta: Dict[str, Any]) -> List[Dict[str, Any]]:
+@dataclass(slots=True)
+class CartaFiltrada:
+    """
+    Registro de salida del scraper: una carta o, en cartas de doble cara, una de sus caras.
+    Los campos se serializan (orjson) en este mismo orden.
+    """
+    oracle_id: Optional[str]
+    parent_id: Optional[str]
+    face_number: Optional[int]
+    name: Optional[str]
+    lang: Optional[str]
+    released_at: Optional[str]
+    image_png: Optional[str]
+    mana_cost: Optional[str]
+    cmc: Optional[float]
+    type_line: Optional[str]
+    oracle_text: Optional[str]
+    power: Optional[str]
+    toughness: Optional[str]
+    colors: List[str]
+    color_identity: List[str]
+    keywords: List[str]
+    produced_mana: List[str]
+    commander_legality: Optional[str]
+    game_changer: Optional[bool]
+    set_name: Optional[str]
+    rarity: Optional[str]
+    artist: Optional[str]
+    full_art: Optional[bool]
+    booster: Optional[bool]
+    price_usd: Optional[str]
+    price_usd_foil: Optional[str]
+    price_usd_etched: Optional[str]
+    cardmarket_url: Optional[str]
+    # Fila del array numpy que devuelve el modelo; orjson la serializa como lista de floats
+    embedding: Optional[Any] = None
+
+def filtrar_carta(carta: Dict[str, Any]) -> List[CartaFiltrada]:
     """
     Filtra los campos específicos de una carta según los requerimientos.
     Para cartas de doble cara, devuelve una lista con ambas caras.
     Para cartas normales, devuelve una lista con un solo elemento.
     """
     cartas_resultado = []
+    # Métodos ligados a nombres locales: se llaman decenas de veces por carta
+    carta_get = carta.get
+    append = cartas_resultado.append
+
+    # Subobjetos de la carta completa: se leen una vez y sin crear un {} vacío si faltan
+    prices = carta_get("prices")
+    legalities = carta_get("legalities")
+    purchase_uris = carta_get("purchase_uris")
+    price_usd = prices.get("usd") if prices else None
+    price_usd_foil = prices.get("usd_foil") if prices else None
+    price_usd_etched = prices.get("usd_etched") if prices else None
+    commander_legality = legalities.get("commander") if legalities else None
+    cardmarket_url = purchase_uris.get("cardmarket") if purchase_uris else None
 
     # Verificar si la carta tiene múltiples caras
     if 'card_faces' in carta and len(carta['card_faces']) > 0:
         # Carta de doble cara - crear un registro por cada cara
         for i, face in enumerate(carta['card_faces']):
+            face_get = face.get
             # Preferir el campo `face_number` si lo provee la API, si no usar el índice
-            face_number = face.get('face_number') if isinstance(face, dict) else None
+            face_number = face_get('face_number')
             if face_number is None:
                 face_number = i
+            image_uris = face_get("image_uris")
+            # Usar el CMC de la cara si lo trae la API; si no, calcularlo desde su coste de maná
+            face_cmc = face_get("cmc")
+            if face_cmc is None:
+                face_cmc = _parse_mana_cost_to_cmc(face_get("mana_cost"))
 
-            carta_filtrada = {
+            carta_filtrada = CartaFiltrada(
                 # Usar `oracle_id` como identificador principal en lugar del id Scryfall
-                "oracle_id": carta.get("oracle_id"),
+                oracle_id=carta_get("oracle_id"),
                 # Mantener el id original de Scryfall como referencia si se necesita
-                "parent_id": carta.get("id"),
-                "face_number": face_number,
-                "name": face.get("name"),
-                "lang": carta.get("lang"),
-                "released_at": carta.get("released_at"),
-                "image_png": face.get("image_uris", {}).get("png") if isinstance(face, dict) and "image_uris" in face else None,
-                "mana_cost": face.get("mana_cost"),
-                # Para cartas de doble cara, usar el CMC calculado desde el coste de cada cara
-                "cmc": _parse_mana_cost_to_cmc(face.get("mana_cost")),
-                "type_line": face.get("type_line"),
-                "oracle_text": face.get("oracle_text"),
-                "power": face.get("power"),
-                "toughness": face.get("toughness"),
-                "colors": face.get("colors", []),
-                "color_identity": carta.get("color_identity", []),  # Color identity es de la carta completa
-                "keywords": carta.get("keywords", []),  # Keywords de la carta completa
-                "produced_mana": face.get("produced_mana", carta.get("produced_mana", [])),
-                "commander_legality": carta.get("legalities", {}).get("commander"),
-                "game_changer": carta.get("game_changer"),
-                "set_name": carta.get("set_name"),
-                "rarity": carta.get("rarity"),
-                "artist": face.get("artist", carta.get("artist")),
-                "full_art": carta.get("full_art"),
-                "booster": carta.get("booster"),
-                "price_usd": carta.get("prices", {}).get("usd"),
-                "price_usd_foil": carta.get("prices", {}).get("usd_foil"),
-                "price_usd_etched": carta.get("prices", {}).get("usd_etched"),
-                "cardmarket_url": carta.get("purchase_uris", {}).get("cardmarket")
-            }
-
-            # Concatenar todos los campos excepto los excluidos
-            concat_text = " ".join([
-                f"oracle_id: {carta_filtrada.get('oracle_id')}",
-                f"parent_id: {carta_filtrada.get('parent_id')}",
-                f"face_number: {carta_filtrada.get('face_number')}",
-                f"name: {carta_filtrada.get('name')}",
-                f"lang: {carta_filtrada.get('lang')}",
-                f"released_at: {carta_filtrada.get('released_at')}",
-                f"image_png: {carta_filtrada.get('image_png')}",
-                f"mana_cost: {carta_filtrada.get('mana_cost')}",
-                f"cmc: {carta_filtrada.get('cmc')}",
-                f"type_line: {carta_filtrada.get('type_line')}",
-                f"oracle_text: {carta_filtrada.get('oracle_text')}",
-                f"power: {carta_filtrada.get('power')}",
-                f"toughness: {carta_filtrada.get('toughness')}",
-                f"colors: {carta_filtrada.get('colors')}",
-                f"color_identity: {carta_filtrada.get('color_identity')}",
-                f"keywords: {carta_filtrada.get('keywords')}",
-                f"produced_mana: {carta_filtrada.get('produced_mana')}",
-                f"commander_legality: {carta_filtrada.get('commander_legality')}",
-                f"game_changer: {carta_filtrada.get('game_changer')}",
-                f"set_name: {carta_filtrada.get('set_name')}",
-                f"rarity: {carta_filtrada.get('rarity')}",
-                f"artist: {carta_filtrada.get('artist')}",
-                f"full_art: {carta_filtrada.get('full_art')}",
-                f"booster: {carta_filtrada.get('booster')}",
-                f"price_usd: {carta_filtrada.get('price_usd')}"
-            ])
-
-            # Generar embedding
-            vector = model.encode(concat_text).tolist()
-            carta_filtrada["embedding"] = vector
-
-            cartas_resultado.append(carta_filtrada)
+                parent_id=carta_get("id"),
+                face_number=face_number,
+                name=face_get("name"),
+                lang=carta_get("lang"),
+                released_at=carta_get("released_at"),
+                image_png=image_uris.get("png") if image_uris else None,
+                mana_cost=face_get("mana_cost"),
+                cmc=face_cmc,
+                type_line=face_get("type_line"),
+                oracle_text=face_get("oracle_text"),
+                power=face_get("power"),
+                toughness=face_get("toughness"),
+                colors=face_get("colors", []),
+                color_identity=carta_get("color_identity", []),  # Color identity es de la carta completa
+                keywords=carta_get("keywords", []),  # Keywords de la carta completa
+                produced_mana=face_get("produced_mana", carta_get("produced_mana", [])),
+                commander_legality=commander_legality,
+                game_changer=carta_get("game_changer"),
+                set_name=carta_get("set_name"),
+                rarity=carta_get("rarity"),
+                artist=face_get("artist", carta_get("artist")),
+                full_art=carta_get("full_art"),
+                booster=carta_get("booster"),
+                price_usd=price_usd,
+                price_usd_foil=price_usd_foil,
+                price_usd_etched=price_usd_etched,
+                cardmarket_url=cardmarket_url,
+            )
+
+            append(carta_filtrada)
     else:
         # Carta de una sola cara
-        carta_filtrada = {
+        image_uris = carta_get("image_uris")
+        carta_filtrada = CartaFiltrada(
             # Usar `oracle_id` como identificador principal
-            "oracle_id": carta.get("oracle_id"),
-            "parent_id": None,
+            oracle_id=carta_get("oracle_id"),
+            parent_id=None,
             # Si la API incluye face_number a nivel de carta, lo usamos, si no None
-            "face_number": carta.get("face_number"),
-            "name": carta.get("name"),
-            "lang": carta.get("lang"),
-            "released_at": carta.get("released_at"),
-            "image_png": carta.get("image_uris", {}).get("png") if "image_uris" in carta else None,
-            "mana_cost": carta.get("mana_cost"),
-            "cmc": carta.get("cmc"),
-            "type_line": carta.get("type_line"),
-            "oracle_text": carta.get("oracle_text"),
-            "power": carta.get("power"),
-            "toughness": carta.get("toughness"),
-            "colors": carta.get("colors", []),
-            "color_identity": carta.get("color_identity", []),
-            "keywords": carta.get("keywords", []),
-            "produced_mana": carta.get("produced_mana", []),
-            "commander_legality": carta.get("legalities", {}).get("commander"),
-            "game_changer": carta.get("game_changer"),
-            "set_name": carta.get("set_name"),
-            "rarity": carta.get("rarity"),
-            "artist": carta.get("artist"),
-            "full_art": carta.get("full_art"),
-            "booster": carta.get("booster"),
-            "price_usd": carta.get("prices", {}).get("usd"),
-            "price_usd_foil": carta.get("prices", {}).get("usd_foil"),
-            "price_usd_etched": carta.get("prices", {}).get("usd_etched"),
-            "cardmarket_url": carta.get("purchase_uris", {}).get("cardmarket")
-        }
-
-        # Concatenar todos los campos excepto los excluidos
-        concat_text = " ".join([
-                f"oracle_id: {carta_filtrada.get('oracle_id')}",
-                f"face_number: {carta_filtrada.get('face_number')}",
-                f"name: {carta_filtrada.get('name')}",
-                f"lang: {carta_filtrada.get('lang')}",
-                f"released_at: {carta_filtrada.get('released_at')}",
-                f"image_png: {carta_filtrada.get('image_png')}",
-                f"mana_cost: {carta_filtrada.get('mana_cost')}",
-                f"cmc: {carta_filtrada.get('cmc')}",
-                f"type_line: {carta_filtrada.get('type_line')}",
-                f"oracle_text: {carta_filtrada.get('oracle_text')}",
-                f"power: {carta_filtrada.get('power')}",
-                f"toughness: {carta_filtrada.get('toughness')}",
-                f"colors: {carta_filtrada.get('colors')}",
-                f"color_identity: {carta_filtrada.get('color_identity')}",
-                f"keywords: {carta_filtrada.get('keywords')}",
-                f"produced_mana: {carta_filtrada.get('produced_mana')}",
-                f"commander_legality: {carta_filtrada.get('commander_legality')}",
-                f"game_changer: {carta_filtrada.get('game_changer')}",
-                f"set_name: {carta_filtrada.get('set_name')}",
-                f"rarity: {carta_filtrada.get('rarity')}",
-                f"artist: {carta_filtrada.get('artist')}",
-                f"full_art: {carta_filtrada.get('full_art')}",
-                f"booster: {carta_filtrada.get('booster')}",
-                f"price_usd: {carta_filtrada.get('price_usd')}"
-            ])
-
-            # Generar embedding
-        vector = model.encode(concat_text).tolist()
-        carta_filtrada["embedding"] = vector
-
-        cartas_resultado.append(carta_filtrada)
+            face_number=carta_get("face_number"),
+            name=carta_get("name"),
+            lang=carta_get("lang"),
+            released_at=carta_get("released_at"),
+            image_png=image_uris.get("png") if image_uris else None,
+            mana_cost=carta_get("mana_cost"),
+            cmc=carta_get("cmc"),
+            type_line=carta_get("type_line"),
+            oracle_text=carta_get("oracle_text"),
+            power=carta_get("power"),
+            toughness=carta_get("toughness"),
+            colors=carta_get("colors", []),
+            color_identity=carta_get("color_identity", []),
+            keywords=carta_get("keywords", []),
+            produced_mana=carta_get("produced_mana", []),
+            commander_legality=commander_legality,
+            game_changer=carta_get("game_changer"),
+            set_name=carta_get("set_name"),
+            rarity=carta_get("rarity"),
+            artist=carta_get("artist"),
+            full_art=carta_get("full_art"),
+            booster=carta_get("booster"),
+            price_usd=price_usd,
+            price_usd_foil=price_usd_foil,
+            price_usd_etched=price_usd_etched,
+            cardmarket_url=cardmarket_url,
+        )
+
+        append(carta_filtrada)
 
     return cartas_resultado
 
+# Tamaño de bloque al leer la descarga del dataset y bloques que pueden esperar en cola
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_QUEUE_SIZE = 16
+
+def _leer_descarga(response: requests.Response, cola: queue.Queue, parar: threading.Event) -> None:
+    """
+    Hilo lector: deja en `cola` los bloques de la descarga (ya descomprimidos) hasta terminar
+    o hasta que se active `parar`. Al final encola None, o la excepción si la lectura falla.
+    """
+    def poner(item) -> bool:
+        while not parar.is_set():
+            try:
+                cola.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            if not poner(chunk):
+                return
+    except Exception as e:
+        poner(e)
+        return
+    poner(None)
+
+def _cartas_en_streaming(response: requests.Response) -> Iterator[Dict[str, Any]]:
+    """
+    Devuelve las cartas del dataset a medida que se descargan. Un hilo lee de la red mientras
+    este parsea y filtra, con una cola acotada entre ambos para no acumular la descarga.
+    ijson usa el backend C (yajl2_c) si está disponible; use_float para obtener float en lugar
+    de Decimal.
+    """
+    cola: queue.Queue = queue.Queue(maxsize=DOWNLOAD_QUEUE_SIZE)
+    parar = threading.Event()
+    threading.Thread(target=_leer_descarga, args=(response, cola, parar), daemon=True).start()
+
+    cartas = ijson.sendable_list()
+    parser = ijson.items_coro(cartas, "item", use_float=True)
+    try:
+        for chunk in iter(cola.get, None):
+            if isinstance(chunk, Exception):
+                raise chunk
+            parser.send(chunk)
+            yield from cartas
+            del cartas[:]
+        parser.close()  # fin de la entrada: valida que el JSON esté completo
+        yield from cartas
+    finally:
+        # Si se deja de consumir antes de tiempo, el hilo lector termina en su siguiente bloque
+        parar.set()
+
+def _filtrar_cartas(cartas: Iterable[Dict[str, Any]]) -> Iterator[List[CartaFiltrada]]:
+    """
+    Devuelve, en el orden de entrada, los registros filtrados de cada carta.
+    Se filtra en este mismo proceso: repartir las cartas entre procesos no compensa, porque
+    filtrar una carta cuesta lo mismo que enviarla a otro proceso y devolver el resultado.
+    """
+    for carta in cartas:
+        yield filtrar_carta(carta)
+
+# Campos que se concatenan, en este orden, para generar el embedding de cada registro.
+# `parent_id` solo se incluye en las caras de cartas dobles (en las de una cara es None).
+_CAMPOS_EMBEDDING = (
+    "oracle_id", "parent_id", "face_number", "name", "lang", "released_at", "image_png",
+    "mana_cost", "cmc", "type_line", "oracle_text", "power", "toughness", "colors",
+    "color_identity", "keywords", "produced_mana", "commander_legality", "game_changer",
+    "set_name", "rarity", "artist", "full_art", "booster", "price_usd",
+)
+_CAMPOS_EMBEDDING_UNA_CARA = tuple(c for c in _CAMPOS_EMBEDDING if c != "parent_id")
+
+def _texto_embedding(carta_filtrada: CartaFiltrada) -> str:
+    """
+    Concatena los campos de un registro filtrado en el texto del que se genera su embedding.
+    """
+    campos = _CAMPOS_EMBEDDING if carta_filtrada.parent_id is not None else _CAMPOS_EMBEDDING_UNA_CARA
+    return " ".join(f"{campo}: {getattr(carta_filtrada, campo)}" for campo in campos)
+
+def _generar_embeddings(cartas_filtradas: List[CartaFiltrada], batch_size: int = 64) -> None:
+    """
+    Añade el campo `embedding` a cada registro. Se codifican todos los textos en una sola
+    llamada al modelo, por lotes, en lugar de una llamada por carta.
+    """
+    textos = [_texto_embedding(carta) for carta in cartas_filtradas]
+    vectores = model.encode(textos, batch_size=batch_size)
+    # Se guardan las filas numpy tal cual, sin .tolist(): se evita crear un float de Python por
+    # dimensión y registro
+    for carta, vector in zip(cartas_filtradas, vectores):
+        carta.embedding = vector
+
+# Buffer de escritura del archivo de salida: pocas llamadas write() grandes
+OUTPUT_WRITE_BUFFER = 1 << 20
+
+def _guardar_cartas(output_path: Path, cartas_filtradas: List[CartaFiltrada]) -> None:
+    """
+    Escribe las cartas como array JSON con un registro por línea (mismo formato que usa la API).
+    Se serializa registro a registro, sin sangría, para no tener el archivo entero en memoria;
+    el resultado sigue siendo JSON válido y se puede recorrer línea a línea.
+    """
+    with open(output_path, 'wb', buffering=OUTPUT_WRITE_BUFFER) as f:
+        f.write(b"[\n")
+        for i, carta in enumerate(cartas_filtradas):
+            if i:
+                f.write(b",\n")
+            f.write(orjson.dumps(carta, option=orjson.OPT_SERIALIZE_NUMPY))
+        f.write(b"\n]\n")
+
 def descargar_cartas_scryfall() -> Optional[str]:
     """
     Descarga todas las cartas de Magic: The Gathering desde la API de Scryfall
@@ -235,7 +349,7 @@ def descargar_cartas_scryfall() -> Optional[str]:
         
         logger.success("Conexión establecida correctamente con la API")
         
-        bulk_data = response.json()
+        bulk_data = orjson.loads(response.content)
         
         # Buscar el archivo de "default_cards" (todas las cartas)
         default_cards = None
@@ -267,88 +381,84 @@ def descargar_cartas_scryfall() -> Optional[str]:
         
         logger.download_progress("Descargando dataset completo...")
         
-        response = requests.get(download_url, stream=True)
+        # Pedir la descarga comprimida (br no: urllib3 solo lo decodifica si está instalado brotli)
+        response = requests.get(download_url, stream=True, headers={"Accept-Encoding": "gzip, deflate"})
         response.raise_for_status()
         
-        logger.success("Descarga completada")
-        logger.download_progress("Parseando JSON...")
+        logger.success("Conexión de descarga establecida")
+        logger.info(f"Codificación de la descarga: {response.headers.get('Content-Encoding', 'identity')}")
+        logger.download_progress("Parseando, filtrando y deduplicando JSON en streaming...")
         
-        # Parsear el JSON
+        # Parsear el JSON carta a carta mientras se descarga: cada carta se filtra y se libera
+        # sin cargar el dataset completo en memoria ni volcarlo a disco
         print("Procesando datos...")
-        cartas = response.json()
-        
-        logger.info(f"JSON parseado correctamente: {len(cartas)} cartas encontradas")
-        
-        # Filtrar solo los campos necesarios
-        print(f"Filtrando campos de {len(cartas)} cartas...")
-        logger.download_progress(f"Filtrando {len(cartas)} cartas...")
-        
-        cartas_filtradas = []
-        for carta in cartas:
-            cartas_filtradas.extend(filtrar_carta(carta))  # extend porque puede devolver múltiples caras
+        cartas = _cartas_en_streaming(response)
         
-        logger.success(f"Filtrado completado: {len(cartas_filtradas)} registros procesados (incluyendo caras de cartas dobles)")
-        #logger.set_cards_count(len(cartas_filtradas))
-
-        # Deduplicar por oracle_id:
-        # - Si un oracle_id tiene varias entradas y alguna de ellas tiene `face_number` (cartas doble cara),
-        #   conservar todas las caras para ese oracle_id (mantener unidos los registros de la carta).
+        # Filtrar y deduplicar por oracle_id en una sola pasada, a medida que llegan las cartas:
+        # - Si un oracle_id tiene alguna entrada con `face_number` (cartas doble cara),
+        #   conservar todas las caras para ese oracle_id (mantener unidos los registros de la carta),
+        #   eligiendo la más barata entre las que comparten el mismo face_number.
         # - Si un oracle_id tiene solo registros sin `face_number` (cartas de una sola cara),
         #   conservar únicamente la entrada más barata (empates al azar).
-        def _price_value(rec):
-            p = rec.get('price_usd')
+        # Ambos casos se resuelven con el mismo mapa: clave -> {cara -> (precio, registro)}, donde
+        # los registros sin face_number comparten la cara '__none__'.
+        total_cartas = 0
+        total_registros = 0
+        # defaultdict: no se crea un {} de descarte por registro como con setdefault
+        groups: DefaultDict[Any, Dict[Any, Tuple[float, CartaFiltrada]]] = defaultdict(dict)
+        # Nombres locales para el bucle caliente (LOAD_FAST en lugar de búsquedas de atributo)
+        inf = float('inf')
+        rand = random.random
+        for registros in _filtrar_cartas(cartas):
+            total_cartas += 1
+            # Todas las caras de una carta comparten precio: se convierte una vez por carta
+            # (sin precio o no numérico -> infinito, nunca gana a uno con precio)
+            p = registros[0].price_usd
             try:
-                return float(p) if p is not None else float('inf')
+                price = float(p) if p is not None else inf
             except (ValueError, TypeError):
-                return float('inf')
-
-        logger.info("Iniciando deduplicado de cartas...")
-        groups = {}
-        for rec in cartas_filtradas:
-            key = rec.get('oracle_id') or rec.get('parent_id') or rec.get('id')
-            if key is None:
-                key = f"_no_oracle_{random.getrandbits(64)}"
-            groups.setdefault(key, []).append(rec)
-
-        result = []
-        for key, items in groups.items():
-            # Si hay varias entradas y al menos una tiene face_number, conservar todas las caras
-            if any(item.get('face_number') is not None for item in items):
-                # Opcional: dentro de las caras con el mismo face_number, elegir la más barata
-                by_face = {}
-                for item in items:
-                    fn = item.get('face_number')
-                    # si fn es None lo tratamos como a su propia "cara"
-                    face_key = fn if fn is not None else '__none__'
-                    if face_key not in by_face:
-                        by_face[face_key] = item
-                    else:
-                        cur = by_face[face_key]
-                        cur_price = _price_value(cur)
-                        new_price = _price_value(item)
-                        if new_price < cur_price:
-                            by_face[face_key] = item
-                        elif new_price == cur_price:
-                            by_face[face_key] = random.choice([cur, item])
-
-                # añadir todas las caras retenidas
-                result.extend(by_face.values())
-            else:
-                # Solo single-face: conservar la más barata
-                best = None
-                best_price = float('inf')
-                for item in items:
-                    price = _price_value(item)
-                    if price < best_price:
-                        best = item
-                        best_price = price
-                    elif price == best_price:
-                        best = random.choice([best, item])
-                if best is not None:
-                    result.append(best)
-
-        cartas_filtradas = result
+                price = inf
+
+            for rec in registros:  # puede devolver múltiples caras
+                total_registros += 1
+                key = rec.oracle_id or rec.parent_id
+                if key is None:
+                    key = f"_no_oracle_{random.getrandbits(64)}"
+                fn = rec.face_number
+                # si fn es None lo tratamos como a su propia "cara"
+                face_key = fn if fn is not None else '__none__'
+
+                by_face = groups[key]
+                cur = by_face.get(face_key)
+                if cur is None or price < cur[0]:
+                    by_face[face_key] = (price, rec)
+                elif price == cur[0] and rand() < 0.5:
+                    # empate: quedarse con cualquiera de los dos al azar
+                    by_face[face_key] = (price, rec)
+
+        # ijson no falla si la respuesta no es un array (p. ej. un objeto de error con 200):
+        # simplemente no produce cartas. No escribir un dataset vacío que sustituya a los buenos.
+        if total_cartas == 0:
+            error_msg = "La descarga no contenía ninguna carta (se esperaba un array JSON de cartas)"
+            print(f"Error: {error_msg}")
+            logger.error(error_msg)
+            logger.fin_scraping(exitoso=False)
+            return None
+
+        logger.success("Descarga completada")
+        logger.info(f"JSON parseado correctamente: {total_cartas} cartas encontradas")
+        logger.success(f"Filtrado completado: {total_registros} registros procesados (incluyendo caras de cartas dobles)")
+
+        cartas_filtradas = [rec for by_face in groups.values() for _, rec in by_face.values()]
+        # Liberar el mapa de deduplicado (diccionarios y tuplas por registro) antes de los embeddings
+        del groups
         logger.success(f"Deduplicado completado: {len(cartas_filtradas)} registros finales")
+
+        # Embeddings solo de los registros que sobreviven al deduplicado, en lote
+        print(f"Generando embeddings de {len(cartas_filtradas)} registros...")
+        logger.download_progress(f"Generando embeddings de {len(cartas_filtradas)} registros...")
+        _generar_embeddings(cartas_filtradas)
+        logger.success("Embeddings generados")
         
         # Guardar en archivo local
 
@@ -358,8 +468,7 @@ def descargar_cartas_scryfall() -> Optional[str]:
 
         logger.info(f"Guardando datos en archivo: {output_path}")
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(cartas_filtradas, f, ensure_ascii=False, indent=2)
+        _guardar_cartas(output_path, cartas_filtradas)
 
         # Calcular tamaño del archivo
         file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
@@ -376,17 +485,22 @@ def descargar_cartas_scryfall() -> Optional[str]:
             """Elimina archivos JSON antiguos dejando solo los max_files más recientes."""
             if not directory.exists():
                 return
-            files = sorted(directory.glob("scryfall_cards_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-            if len(files) > max_files:
-                files_to_delete = files[max_files:]
-                for file_path in files_to_delete:
-                    try:
-                        file_path.unlink()
-                        print(f"Eliminado archivo antiguo: {file_path.name}")
-                        logger.info(f"Archivo antiguo eliminado: {file_path.name}")
-                    except Exception as e:
-                        print(f"No se pudo eliminar {file_path.name}: {e}")
-                        logger.warning(f"No se pudo eliminar {file_path.name}: {e}")
+            with os.scandir(directory) as it:
+                files = [e for e in it if e.name.startswith("scryfall_cards_") and e.name.endswith(".json")]
+            if len(files) <= max_files:
+                return
+            # Solo hace falta conocer los max_files más recientes, no ordenar todo el directorio
+            keep = {e.name for e in heapq.nlargest(max_files, files, key=lambda e: e.stat().st_mtime_ns)}
+            for entry in files:
+                if entry.name in keep:
+                    continue
+                try:
+                    os.unlink(entry.path)
+                    print(f"Eliminado archivo antiguo: {entry.name}")
+                    logger.info(f"Archivo antiguo eliminado: {entry.name}")
+                except Exception as e:
+                    print(f"No se pudo eliminar {entry.name}: {e}")
+                    logger.warning(f"No se pudo eliminar {entry.name}: {e}")
         
         _cleanup_old_files(bulk_data_dir, max_files=3)
         
@@ -403,7 +517,7 @@ def descargar_cartas_scryfall() -> Optional[str]:
         logger.fin_scraping(exitoso=False)
         return None
         
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, ijson.JSONError) as e:
         error_msg = f"Error al procesar el JSON: {e}"
         print(f"\n{error_msg}")
         logger.error(error_msg)